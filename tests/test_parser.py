@@ -43,6 +43,23 @@ def test_parse_block():
     assert doc.nodes[0].value["host"] == "localhost"
 
 
+def test_parse_nested_block():
+    doc = parse(
+        "server {\n"
+        "  tls {\n    enabled!bool true\n  }\n"
+        "  ports [\n    80\n    {\n      name http\n    }\n  ]\n"
+        "  hosts [a, b]\n"
+        "  motd ```\nhello\n```\n"
+        "}"
+    )
+    assert doc.nodes[0].value == {
+        "tls": {"enabled": "true"},
+        "ports": ["80", {"name": "http"}],
+        "hosts": ["a", "b"],
+        "motd": "hello",
+    }
+
+
 def test_parse_list():
     doc = parse("fruits [\napple\nbanana\ncherry\n]")
     assert len(doc.nodes) == 1
@@ -59,6 +76,17 @@ def test_parse_inline_list():
     assert doc.nodes[0].value[0] == "red"
 
 
+def test_parse_inline_list_whitespace():
+    doc = parse("colors [ red ,green,\tblue , ]")
+    assert doc.nodes[0].value == ["red", "green", "blue", ""]
+
+
+def test_parse_empty_inline_lists_are_independent():
+    doc = parse("a []\nb [ ]")
+    doc.nodes[0].value.append("x")
+    assert doc.nodes[1].value == []
+
+
 def test_parse_multiline():
     doc = parse("description ```\nLine 1\nLine 2\n```")
     assert len(doc.nodes) == 1
@@ -66,11 +94,50 @@ def test_parse_multiline():
     assert "Line 2" in doc.nodes[0].value
 
 
+def test_parse_stream():
+    lines = iter(["server {\n", "host localhost\n", "}\n", "notes ```\n", "a\n", "b\n", "```\n"])
+    doc = Parser().parse_stream(lines)
+    assert len(doc.nodes) == 2
+    assert doc.nodes[0].value == {"host": "localhost"}
+    assert doc.nodes[1].value == "a\nb"
+
+
+def test_parse_stream_source_error_passes_through():
+    def lines():
+        yield "name John\n"
+        yield "notes ```\n"
+        raise OSError("disk")
+
+    with pytest.raises(OSError, match="^disk$"):
+        Parser().parse_stream(lines())
+
+
+def test_parse_error_reports_line(monkeypatch):
+    def fail(self, s):
+        raise ValueError("bad list")
+
+    monkeypatch.setattr(Parser, "_parse_inline_list", fail)
+    # Reports the failing nested line, not the enclosing top-level entry
+    with pytest.raises(ParseError, match=r"^line 3: bad list$"):
+        parse("name John\nserver {\n  hosts [a, b]\n}")
+
+
+def test_parse_multiline_dedent():
+    doc = parse("code!2 ```\n  def f():\n    pass\nx\n```")
+    assert doc.nodes[0].value == "def f():\n  pass\nx"
+
+
 def test_parser_instance():
     parser = Parser()
     assert parser is not None
 
 
+def test_parser_memoize_option():
+    parser = Parser(memoize=True)
+    assert parser.memoize
+    assert parser.parse_document("name John").nodes[0].value == "John"
+
+
 def test_document():
     doc = Document()
     assert doc.is_empty()